@@ -3,77 +3,141 @@
 Parse Encyclopaedia Britannica ALTO XML files and extract entry titles, text, and images.
 """
 
-import xml.etree.ElementTree as ET
+import functools
+import json
+import mmap
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# ALTO XML namespace
+ALTO_NAMESPACE = 'http://www.loc.gov/standards/alto/v3/alto.xsd'
+
+# Fully qualified (Clark notation) ALTO tag names, so the streaming loop
+# can compare tags directly instead of resolving the namespace prefix
+TEXTLINE_TAG = f'{{{ALTO_NAMESPACE}}}TextLine'
+STRING_TAG = f'{{{ALTO_NAMESPACE}}}String'
+FILENAME_TAG = f'{{{ALTO_NAMESPACE}}}fileName'
+
+try:
+    # lxml is considerably faster and lighter on large ALTO pages. It can also
+    # filter events by tag in C, so String/SP events never reach Python.
+    from lxml import etree as ET
+    _ITERPARSE_OPTIONS = {
+        'tag': (TEXTLINE_TAG, FILENAME_TAG),
+        'huge_tree': False,
+        'collect_ids': False,
+        'remove_blank_text': True
+    }
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_OPTIONS = {}
+
+try:
+    # Much faster JSON encoder, used for the CLI output when installed
+    import orjson
+except ImportError:
+    orjson = None
+
+# Entry detection patterns, compiled once rather than on every line
+# Leading all-caps title, followed by a comma, a period or the end of the line.
+# 'body' is only set for single-line entries: "TITLE, text here." or "TITLE. Text here."
+_ENTRY_RE = re.compile(r'^(?P<title>[A-Z][A-Z\s\-]+?)(?:[\.,](?:\s+(?P<body>.+)$)?|$)')
+# Finds a complete all-caps word of 3+ letters (search stops at the first one)
+_HAS_CAPS_WORD = re.compile(r'\b[A-Z]{3,}\b').search
+
+
+# Image name (suffix, extension) pairs to look for, in order of preference
+_IMAGE_CANDIDATES = tuple((suffix, ext)
+                          for ext in ('.jpg', '.jpeg', '.png', '.jp2')
+                          for suffix in ('.3', '.34', ''))
+
+
+@functools.lru_cache(maxsize=64)
+def _image_index(image_dir):
+    """
+    List the files in an image directory once.
+    Pages of the same collection share a directory, so each lookup after the
+    first one is a set membership test instead of a stat per candidate name.
+    """
+    try:
+        with os.scandir(image_dir) as it:
+            return frozenset(entry.name for entry in it if entry.is_file())
+    except OSError:
+        return frozenset()
+
 
 class BritannicaParser:
     """Parser for Encyclopaedia Britannica ALTO XML files."""
 
-    # ALTO XML namespace
-    ALTO_NS = {'alto': 'http://www.loc.gov/standards/alto/v3/alto.xsd'}
+    # ALTO XML namespace prefix map, kept for callers using find()/findall()
+    # themselves; the parser only uses the Clark notation tag names
+    ALTO_NS = {'alto': ALTO_NAMESPACE}
 
     def __init__(self, xml_path):
         """Initialize parser with path to ALTO XML file."""
         self.xml_path = xml_path
-        self.tree = ET.parse(xml_path)
-        self.root = self.tree.getroot()
-
-    def get_image_path(self):
-        """Extract the image file path from the XML."""
-        file_name_elem = self.root.find('.//alto:fileName', self.ALTO_NS)
-        if file_name_elem is not None:
-            return file_name_elem.text
-        return None
-
-    def get_text_lines(self):
-        """Extract all text lines from the page."""
-        lines = []
-        text_lines = self.root.findall('.//alto:TextLine', self.ALTO_NS)
-
-        for text_line in text_lines:
-            # Get all String elements in this line
-            strings = text_line.findall('.//alto:String', self.ALTO_NS)
-            words = []
-
-            for string in strings:
-                content = string.get('CONTENT', '')
-                if content:
-                    words.append(content)
+        self._image_path = None
+        self._lines = None
 
-            if words:
-                lines.append(' '.join(words))
-
-        return lines
-
-    def merge_duplicate_entries(self, entries):
+    def _stream_lines(self):
         """
-        Merge entries with the same or very similar titles.
-        This handles cases where page headers create duplicate entries.
+        Stream through the XML file once, yielding the text of each TextLine.
+        The image file name is picked up during the same pass, and each
+        TextLine is released as soon as it has been read.
         """
-        if not entries:
-            return entries
-
-        merged = {}
-        for entry in entries:
-            title = entry['title']
+        with open(self.xml_path, 'rb') as f:
+            # Parse straight from a memory map of the file rather than through
+            # Python's buffered reader (empty files cannot be mapped)
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                    yield from self._iter_text_lines(source)
+            else:
+                yield from self._iter_text_lines(f)
+
+    def _iter_text_lines(self, source):
+        """Yield the text of each TextLine in an XML file object."""
+        for event, elem in ET.iterparse(source, events=('end',), **_ITERPARSE_OPTIONS):
+            tag = elem.tag
+
+            if tag == TEXTLINE_TAG:
+                words = []
+                for string in elem.iter(STRING_TAG):
+                    content = string.get('CONTENT', '')
+                    if content:
+                        words.append(content)
+
+                elem.clear()
+                # With lxml, also drop the already processed siblings
+                if hasattr(elem, 'getprevious'):
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+
+                if words:
+                    yield ' '.join(words)
+            elif tag == FILENAME_TAG and self._image_path is None:
+                self._image_path = elem.text
+
+    def _scan(self):
+        """
+        Read the XML file on first use and cache the result.
 
-            # Normalize the title for comparison
-            normalized_title = title.strip().rstrip(',.')
+        Returns:
+            Tuple of (image path from the XML, list of text lines)
+        """
+        if self._lines is None:
+            self._lines = list(self._stream_lines())
+        return self._image_path, self._lines
 
-            if normalized_title in merged:
-                # Merge with existing entry by appending text
-                merged[normalized_title]['text'] += ' ' + entry['text']
-            else:
-                # New entry
-                merged[normalized_title] = {
-                    'title': normalized_title,
-                    'text': entry['text']
-                }
+    def get_image_path(self):
+        """Extract the image file path from the XML."""
+        return self._scan()[0]
 
-        return list(merged.values())
+    def get_text_lines(self):
+        """Extract all text lines from the page."""
+        return self._scan()[1]
 
     def extract_entries(self):
         """
@@ -81,57 +145,48 @@ class BritannicaParser:
         An entry typically starts with an all-caps word or phrase followed by a comma.
         """
         lines = self.get_text_lines()
-        entries = []
-        current_entry = None
+
+        # Lines are collected per title and joined at the end. Entries with the
+        # same title are merged as they are read, which handles cases where
+        # page headers create duplicate entries.
+        merged = defaultdict(list)
+        current_parts = None
 
         for line in lines:
+            # Classify the line once: single-line entry, title line or continuation
+            match = _ENTRY_RE.match(line)
+
             # Check for single-line entries (title and text on same line)
             # Pattern: "TITLE, text here." or "TITLE. Text here."
-            single_line_match = re.match(r'^([A-Z][A-Z\s\-]+?)([\.,])\s+(.+)$', line)
-
-            if single_line_match:
-                title = single_line_match.group(1).strip()
+            if match and match.group('body'):
+                title = match.group('title').strip()
                 text = line  # Keep the full line as text
 
-                # Validate the title
-                words = re.findall(r'\b[A-Z]{3,}\b', title)
-
-                # Skip single-letter prefixes
-                if re.match(r'^[A-Z]\s', title) or re.match(r'^[A-Z]$', title):
+                # Skip single-letter prefixes (titles always start with a capital,
+                # so only the second character needs checking)
+                if len(title) == 1 or title[1].isspace():
                     # Not a valid title, treat as continuation
-                    if current_entry:
-                        current_entry['text'] += ' ' + line
+                    if current_parts is not None:
+                        current_parts.append(line)
                     continue
 
                 # Skip titles with excessive spacing
                 if title.count(' ') > 10:
-                    if current_entry:
-                        current_entry['text'] += ' ' + line
+                    if current_parts is not None:
+                        current_parts.append(line)
                     continue
 
-                # Must have enough content and valid title
-                if len(title) >= 5 and len(words) >= 1 and len(text) > 10:
-                    # Save the previous entry
-                    if current_entry:
-                        entries.append(current_entry)
-
-                    # Create new complete entry
-                    current_entry = {
-                        'title': title,
-                        'text': text
-                    }
-
+                # Must have enough content and valid title (cheap length checks first)
+                if len(title) >= 5 and len(text) > 10 and _HAS_CAPS_WORD(title):
                     # This is a complete entry, save it immediately
-                    entries.append(current_entry)
-                    current_entry = None
+                    merged[title].append(text)
+                    current_parts = None
                     continue
 
             # Check for multi-line entries (title on its own line)
             # Pattern: starts with uppercase word(s), may have comma or period
-            match = re.match(r'^([A-Z][A-Z\s\-]+?)(?:,|\.|$)', line)
-
             if match:
-                title = match.group(1).strip().rstrip(',.')
+                title = match.group('title').strip().rstrip(',.')
 
                 # Additional validation to avoid page headers and fragments:
                 # 1. Title should be at least 5 characters
@@ -139,79 +194,68 @@ class BritannicaParser:
                 # 3. Should contain at least one complete word of 3+ letters
                 # 4. Should not have excessive spacing (OCR artifact like "M A G N E T I S M")
 
-                # Skip single-letter prefixes
-                if re.match(r'^[A-Z]\s', title) or re.match(r'^[A-Z],', title):
+                # Skip single-letter prefixes (the title cannot contain a comma,
+                # so only a space can follow the first letter)
+                if title[1:2].isspace():
                     continue
 
                 # Skip titles with excessive spacing (more than 10 spaces suggests OCR issues)
                 if title.count(' ') > 10:
                     continue
 
-                words = re.findall(r'\b[A-Z]{3,}\b', title)
-
-                if len(title) >= 5 and len(words) >= 1:
+                if len(title) >= 5 and _HAS_CAPS_WORD(title):
                     # Start a new entry
-                    if current_entry:
-                        entries.append(current_entry)
-
-                    current_entry = {
-                        'title': title,
-                        'text': line
-                    }
-                elif current_entry:
+                    current_parts = merged[title]
+                    current_parts.append(line)
+                elif current_parts is not None:
                     # If it doesn't meet criteria, treat as continuation
-                    current_entry['text'] += ' ' + line
-            elif current_entry:
+                    current_parts.append(line)
+            elif current_parts is not None:
                 # Continue the current entry
-                current_entry['text'] += ' ' + line
+                current_parts.append(line)
 
-        # Add the last entry
-        if current_entry:
-            entries.append(current_entry)
-
-        # Merge duplicate entries
-        entries = self.merge_duplicate_entries(entries)
-
-        return entries
+        return [{'title': title, 'text': ' '.join(parts)} for title, parts in merged.items()]
 
     def find_local_image(self):
         """Find the corresponding image file in the local directory structure."""
-        xml_path = Path(self.xml_path)
         # Get the base name without extension (e.g., 188084090.34)
-        base_name = xml_path.stem
-        # Extract the numeric part before the last dot (e.g., 188084090)
-        image_base = base_name.split('.')[0]
+        # and extract the numeric part before the first dot (e.g., 188084090)
+        image_base = os.path.basename(self.xml_path).split('.')[0]
 
         # Look for image in sibling 'image' directory
-        xml_dir = xml_path.parent
-        image_dir = xml_dir.parent / 'image'
-
-        if image_dir.exists():
-            # Try common image extensions
-            for ext in ['.jpg', '.jpeg', '.png', '.jp2']:
-                # Try with the base number and various suffixes
-                for suffix in ['.3', '.34', '']:
-                    image_file = image_dir / f"{image_base}{suffix}{ext}"
-                    if image_file.exists():
-                        return str(image_file)
+        xml_dir = os.path.dirname(self.xml_path)
+        image_dir = os.path.normpath(os.path.join(os.path.dirname(xml_dir), 'image'))
+
+        names = _image_index(image_dir)
+
+        if names:
+            # Try common image extensions with the base number and various suffixes
+            for suffix, ext in _IMAGE_CANDIDATES:
+                image_name = f"{image_base}{suffix}{ext}"
+                if image_name in names:
+                    return os.path.join(image_dir, image_name)
 
         return None
 
     def parse(self):
         """Parse the XML file and return structured data."""
-        image_path_xml = self.get_image_path()  # Path from XML metadata
+        # Path from XML metadata and the page text, read in a single pass
+        image_path_xml, lines = self._scan()
         image_path_local = self.find_local_image()  # Actual local image file
         entries = self.extract_entries()
 
         # If no entries were found, treat all text as a single entry
         if not entries:
-            lines = self.get_text_lines()
             if lines:
                 entries = [{
                     'title': 'Unknown',
                     'text': ' '.join(lines)
                 }]
 
+        # Release the page text now that the entries have been built, so a parser
+        # that is kept around does not hold on to it (it is re-read if needed)
+        self._lines = None
+
         return {
             'xml_file': self.xml_path,
             'image_path_xml': image_path_xml,  # Original path from XML
@@ -234,7 +278,20 @@ def parse_britannica_file(xml_path):
     return parser.parse()
 
 
-def parse_britannica_directory(directory_path, recursive=True):
+def _parse_one(xml_path):
+    """
+    Parse a single file in a worker process.
+
+    Returns:
+        Tuple of (result, error message); exactly one of them is None
+    """
+    try:
+        return parse_britannica_file(xml_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def parse_britannica_directory(directory_path, recursive=True, workers=None):
     """
     Parse all ALTO XML files in a directory.
 
@@ -244,19 +301,61 @@ def parse_britannica_directory(directory_path, recursive=True):
     Args:
         directory_path: Path to directory containing ALTO XML files or ID subdirectories
         recursive: If True, recursively search all subdirectories (default: True)
+        workers: Number of worker processes to parse files with (default: None, parse serially)
 
     Yields:
         Dictionary with parsed data for each file
     """
-    directory = Path(directory_path)
+    xml_files = _find_xml_files(directory_path, recursive)
+
+    if workers and workers > 1:
+        # Files are independent, so parse them in parallel while keeping the order
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield from _parse_files(xml_files, executor)
+        finally:
+            # Drop queued files if the caller stops iterating early
+            executor.shutdown(cancel_futures=True)
+        return
+
+    yield from _parse_files(xml_files)
+
+
+def _find_xml_files(directory_path, recursive):
+    """Return the ALTO XML file paths in a directory, sorted component-wise."""
+    directory = str(Path(directory_path))
 
-    # Recursively find all XML files in subdirectories
-    pattern = '**/*.xml' if recursive else '*.xml'
-    xml_files = sorted(directory.glob(pattern))  # Sort files for consistent ordering
+    if recursive:
+        # Recursively find all XML files in subdirectories (os.walk is scandir based)
+        xml_files = [os.path.normpath(os.path.join(dirpath, name))
+                     for dirpath, dirnames, filenames in os.walk(directory)
+                     for name in filenames if name.endswith('.xml')]
+    else:
+        try:
+            with os.scandir(directory) as it:
+                xml_files = [os.path.normpath(entry.path) for entry in it
+                             if entry.name.endswith('.xml') and entry.is_file()]
+        except OSError:
+            xml_files = []
+
+    # Sort files component-wise for consistent ordering
+    xml_files.sort(key=lambda xml_file: xml_file.split(os.sep))
+    return xml_files
+
+
+def _parse_files(xml_files, executor=None):
+    """Parse XML files in order, in the executor's worker processes if one is given."""
+    if executor is not None:
+        for xml_file, (result, error) in zip(xml_files, executor.map(_parse_one, xml_files, chunksize=16)):
+            if error is None:
+                yield result
+            else:
+                print(f"Error parsing {xml_file}: {error}")
+        return
 
     for xml_file in xml_files:
         try:
-            yield parse_britannica_file(str(xml_file))
+            yield parse_britannica_file(xml_file)
         except Exception as e:
             print(f"Error parsing {xml_file}: {e}")
 
@@ -271,24 +370,37 @@ def scan_britannica_collection(base_path):
     Returns:
         List of dictionaries with information about each ID directory
     """
-    base = Path(base_path)
     id_dirs = []
 
-    # Find all subdirectories that look like ID directories (numeric names)
-    for item in base.iterdir():
-        if item.is_dir() and item.name.isdigit():
-            alto_dir = item / 'alto'
-            image_dir = item / 'image'
+    # Find all subdirectories that look like ID directories (numeric names).
+    # os.scandir reuses the file type from the directory listing, which saves
+    # a stat call per entry compared to Path.iterdir()/glob()
+    with os.scandir(base_path) as it:
+        for item in it:
+            if not (item.name.isdigit() and item.is_dir()):
+                continue
+
+            alto_dir = os.path.join(item.path, 'alto')
+            image_dir = os.path.join(item.path, 'image')
+            has_alto = os.path.isdir(alto_dir)
+            has_image = os.path.isdir(image_dir)
 
             # Count files in each directory
-            xml_count = len(list(alto_dir.glob('*.xml'))) if alto_dir.exists() else 0
-            image_count = len(list(image_dir.glob('*.*'))) if image_dir.exists() else 0
+            xml_count = 0
+            if has_alto:
+                with os.scandir(alto_dir) as files:
+                    xml_count = sum(1 for f in files if f.name.endswith('.xml') and f.is_file())
+
+            image_count = 0
+            if has_image:
+                with os.scandir(image_dir) as files:
+                    image_count = sum(1 for f in files if '.' in f.name and f.is_file())
 
             id_dirs.append({
                 'id': item.name,
-                'path': str(item),
-                'alto_dir': str(alto_dir) if alto_dir.exists() else None,
-                'image_dir': str(image_dir) if image_dir.exists() else None,
+                'path': item.path,
+                'alto_dir': alto_dir if has_alto else None,
+                'image_dir': image_dir if has_image else None,
                 'xml_count': xml_count,
                 'image_count': image_count
             })
@@ -296,13 +408,14 @@ def scan_britannica_collection(base_path):
     return sorted(id_dirs, key=lambda x: x['id'])
 
 
-def parse_britannica_collection(base_path, verbose=False):
+def parse_britannica_collection(base_path, verbose=False, workers=None):
     """
     Parse an entire Britannica collection with multiple ID subdirectories.
 
     Args:
         base_path: Path to the base directory containing ID subdirectories
         verbose: If True, print progress information
+        workers: Number of worker processes to parse files with (default: None, parse serially)
 
     Yields:
         Dictionary with parsed data for each file, including ID directory info
@@ -317,23 +430,59 @@ def parse_britannica_collection(base_path, verbose=False):
         total_xml = sum(d['xml_count'] for d in id_dirs)
         print(f"Total XML files: {total_xml}")
 
-    # Parse each ID directory
-    for id_dir in id_dirs:
-        if verbose:
-            print(f"Parsing ID {id_dir['id']}: {id_dir['xml_count']} files...")
+    # Share one pool of worker processes across all ID directories
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+
+    try:
+        # Parse each ID directory
+        for id_dir in id_dirs:
+            if verbose:
+                print(f"Parsing ID {id_dir['id']}: {id_dir['xml_count']} files...")
+
+            if id_dir['alto_dir']:
+                xml_files = _find_xml_files(id_dir['alto_dir'], recursive=False)
+                for result in _parse_files(xml_files, executor):
+                    # Add ID to the result
+                    result['collection_id'] = id_dir['id']
+                    yield result
+    finally:
+        if executor is not None:
+            # Drop queued files if the caller stops iterating early
+            executor.shutdown(cancel_futures=True)
+
+
+def _dumps(obj):
+    """Serialize an object to compact UTF-8 encoded JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_json(data, json_path, pretty=False):
+    """Write data to a JSON file, compact unless pretty printing is requested."""
+    with open(json_path, 'wb') as f:
+        if pretty:
+            f.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        else:
+            f.write(_dumps(data))
+
 
-        if id_dir['alto_dir']:
-            for result in parse_britannica_directory(id_dir['alto_dir'], recursive=False):
-                # Add ID to the result
-                result['collection_id'] = id_dir['id']
-                yield result
+def _text_only(result):
+    """Reduce a parse result to entry titles and text (plus collection_id if present)."""
+    filtered_result = {
+        'entries': [{'title': entry['title'], 'text': entry['text']}
+                   for entry in result['entries']]
+    }
+    # Include collection_id if present
+    if 'collection_id' in result:
+        filtered_result['collection_id'] = result['collection_id']
+    return filtered_result
 
 
 def main():
     """Example usage: parse and print entries from sample data."""
     import sys
     import argparse
-    import json
 
     parser = argparse.ArgumentParser(description='Parse Encyclopaedia Britannica ALTO XML files')
     parser.add_argument('path', help='Path to XML file or directory')
@@ -343,10 +492,44 @@ def main():
                         help='Only include title and text in output (exclude image paths)')
     parser.add_argument('--split', type=int, metavar='N',
                         help='Split output into multiple files with N entries each (only with --json)')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='Parse files in a directory using N worker processes')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Stream one JSON object per line as files are parsed (only with --json)')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent the JSON output for readability (only with --json)')
 
     args = parser.parse_args()
     path = args.path
 
+    if args.ndjson and not args.json_output:
+        parser.error('--ndjson requires --json')
+    if args.ndjson and args.split:
+        parser.error('--ndjson cannot be combined with --split')
+    if args.ndjson and args.pretty:
+        parser.error('--ndjson cannot be combined with --pretty')
+
+    # Stream results to the JSON file as they are parsed instead of collecting them first
+    if args.json_output and args.ndjson:
+        if os.path.isfile(path):
+            results = [parse_britannica_file(path)]
+        elif os.path.isdir(path):
+            results = parse_britannica_directory(path, workers=args.workers)
+        else:
+            print(f"Error: {path} is not a valid file or directory")
+            sys.exit(1)
+
+        count = 0
+        with open(args.json_output, 'wb') as f:
+            for result in results:
+                if args.text_only:
+                    result = _text_only(result)
+                f.write(_dumps(result) + b'\n')
+                count += 1
+
+        print(f"Wrote {count} result(s) to {args.json_output}")
+        return
+
     results = []
 
     if os.path.isfile(path):
@@ -368,7 +551,7 @@ def main():
 
     elif os.path.isdir(path):
         # Parse directory
-        for result in parse_britannica_directory(path):
+        for result in parse_britannica_directory(path, workers=args.workers):
             results.append(result)
 
             if not args.json_output:
@@ -391,17 +574,7 @@ def main():
     if args.json_output:
         # Filter results if text-only mode is enabled
         if args.text_only:
-            filtered_results = []
-            for result in results:
-                filtered_result = {
-                    'entries': [{'title': entry['title'], 'text': entry['text']}
-                               for entry in result['entries']]
-                }
-                # Include collection_id if present
-                if 'collection_id' in result:
-                    filtered_result['collection_id'] = result['collection_id']
-                filtered_results.append(filtered_result)
-            output_data = filtered_results
+            output_data = [_text_only(result) for result in results]
         else:
             output_data = results
 
@@ -423,16 +596,14 @@ def main():
                 file_num = (i // args.split) + 1
                 output_file = f"{base_name}_{file_num}{ext}"
 
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump([{'entries': chunk}], f, indent=2, ensure_ascii=False)
+                _write_json([{'entries': chunk}], output_file, pretty=args.pretty)
 
                 total_files += 1
                 print(f"Wrote {len(chunk)} entries to {output_file}")
 
             print(f"Total: {len(all_entries)} entries across {total_files} file(s)")
         else:
-            with open(args.json_output, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            _write_json(output_data, args.json_output, pretty=args.pretty)
             print(f"Wrote {len(output_data)} result(s) to {args.json_output}")
 
 
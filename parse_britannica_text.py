@@ -3,10 +3,57 @@
 Parse plain text Encyclopaedia Britannica files and extract entry titles and text.
 """
 
+import json
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    # Much faster JSON encoder, used for the CLI output when installed
+    import orjson
+except ImportError:
+    orjson = None
+
+# Buffer size for reading text volumes and writing JSON output (1 MiB)
+_BUFFER_SIZE = 1 << 20
+
+# Files up to this size (4 MiB) are read in one go rather than line by line
+_READ_ALL_LIMIT = 4 << 20
+
+# Common header words to skip
+SKIP_PATTERNS = [
+    'ENCYCLOPAEDIA BRITANNICA',
+    'SEVENTH EDITION',
+    'DICTIONARY',
+    'VOLUME',
+    'SCIENCES',
+    'LITERATURE',
+    'DISSERTATIONS',
+    'SUPPLEMENT',
+    'GENERAL INDEX',
+    'ENGRAVINGS',
+    'EDINBURGH'
+]
+
+# Entry detection patterns, compiled once rather than on every line
+# Any of the header words, found in a single scan of the line
+_SKIP_RE = re.compile('|'.join(re.escape(pattern) for pattern in SKIP_PATTERNS))
+# Single-line entry: "TITLE, text here." or "TITLE. Text here."
+_SINGLE_LINE_RE = re.compile(r'^([A-Z][A-Z\s\-]+?)([\.,])\s+(.+)$')
+# Title on its own line, ending with a comma or period
+_TITLE_RE = re.compile(r'^([A-Z][A-Z\s\-,]+?)[\.,]\s*$')
+# Sentence-ending punctuation followed by space or end of string
+_SENTENCE_RE = re.compile(r'[.!?](\s|$)')
+# Words of 3+ letters
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+# Finds a complete all-caps word of 3+ letters (search stops at the first one)
+_HAS_CAPS_WORD = re.compile(r'\b[A-Z]{3,}\b').search
+
+# Non-space characters that can follow the leading capital of a title line
+_TITLE_SECOND_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ-,')
+
 
 class BritannicaTextParser:
     """Parser for plain text Encyclopaedia Britannica files."""
@@ -16,53 +63,62 @@ class BritannicaTextParser:
         self.text_path = text_path
 
     def get_text_lines(self):
-        """Read all lines from the text file."""
-        with open(self.text_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return [line.rstrip() for line in f.readlines()]
+        """
+        Yield the lines of the text file one at a time.
+        Small files are read in one go, which is faster; larger ones are read
+        lazily so large volumes are never held in memory as a whole.
+        """
+        if os.path.getsize(self.text_path) <= _READ_ALL_LIMIT:
+            with open(self.text_path, 'r', encoding='utf-8', errors='ignore') as f:
+                # Split on newlines only, exactly like iterating over the file
+                lines = f.read().split('\n')
+            # A trailing newline does not start another line
+            if not lines[-1]:
+                lines.pop()
+            for line in lines:
+                yield line.rstrip()
+            return
+
+        with open(self.text_path, 'r', encoding='utf-8', errors='ignore', buffering=_BUFFER_SIZE) as f:
+            # Also decode in larger chunks than the default 8 KiB
+            f._CHUNK_SIZE = _BUFFER_SIZE
+            for line in f:
+                yield line.rstrip()
 
     def is_valid_entry(self, text):
         """
         Check if an entry contains at least one complete sentence.
         Valid entries should have proper sentence structure with ending punctuation.
         """
-        if not text or len(text.strip()) < 20:
+        if not text:
+            return False
+
+        stripped = text.strip()
+        if len(stripped) < 20:
             return False
 
         # Check for sentence-ending punctuation followed by space or end of string
         # This indicates at least one complete sentence
-        if re.search(r'[.!?](\s|$)', text):
-            # Also check that it has some actual words (not just punctuation and symbols)
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
-            return len(words) >= 5  # At least 5 words of 3+ letters
+        if _SENTENCE_RE.search(stripped):
+            # Also check that it has some actual words (not just punctuation and symbols).
+            # At least 5 words of 3+ letters; stop scanning as soon as the fifth is found
+            words = 0
+            for _ in _WORD_RE.finditer(stripped):
+                words += 1
+                if words >= 5:
+                    return True
 
         return False
 
-    def merge_duplicate_entries(self, entries):
+    def _close_entry(self, entry, merged):
         """
-        Merge entries with the same or very similar titles.
-        This handles cases where page headers create duplicate entries.
+        Join the collected lines of an entry and, if it is valid, add its text
+        to merged under the normalized title.
         """
-        if not entries:
-            return entries
-
-        merged = {}
-        for entry in entries:
-            title = entry['title']
-
-            # Normalize the title for comparison
-            normalized_title = title.strip().rstrip(',.')
-
-            if normalized_title in merged:
-                # Merge with existing entry by appending text
-                merged[normalized_title]['text'] += ' ' + entry['text']
-            else:
-                # New entry
-                merged[normalized_title] = {
-                    'title': normalized_title,
-                    'text': entry['text']
-                }
-
-        return list(merged.values())
+        if entry and entry['chunks']:
+            text = ' '.join(entry['chunks'])
+            if self.is_valid_entry(text):
+                merged[entry['title'].strip().rstrip(',.')].append(text)
 
     def extract_entries(self):
         """
@@ -70,92 +126,93 @@ class BritannicaTextParser:
         An entry typically starts with an all-caps word or phrase, often with punctuation.
         Skips the header/title page information and entries without complete sentences.
         """
-        lines = self.get_text_lines()
-        entries = []
+        return self._extract_entries()[0]
+
+    def _extract_entries(self):
+        """
+        Extract entries as in extract_entries(), in a single pass over the file.
+
+        Returns:
+            Tuple of (entries, content lines). The content lines are only collected
+            while no entry has been found, for the fallback in parse(), and are
+            empty otherwise.
+        """
+        # Text of the valid entries by normalized title. Entries with the same
+        # title are merged as they are found, which handles cases where page
+        # headers create duplicate entries.
+        merged = defaultdict(list)
         current_entry = None
         in_content = False
+        content_lines = []
 
-        # Common header words to skip
-        skip_patterns = [
-            'ENCYCLOPAEDIA BRITANNICA',
-            'SEVENTH EDITION',
-            'DICTIONARY',
-            'VOLUME',
-            'SCIENCES',
-            'LITERATURE',
-            'DISSERTATIONS',
-            'SUPPLEMENT',
-            'GENERAL INDEX',
-            'ENGRAVINGS',
-            'EDINBURGH'
-        ]
-
-        for line in lines:
+        for line in self.get_text_lines():
             # Skip empty lines
-            if not line.strip():
+            line_stripped = line.strip()
+            if not line_stripped:
                 continue
 
-            line_stripped = line.strip()
+            # Keep the non-trivial lines until the first entry has been found
+            if content_lines is not None:
+                if merged:
+                    content_lines = None
+                elif len(line_stripped) > 2:
+                    content_lines.append(line)
 
             # Skip known header patterns
-            if any(pattern in line_stripped for pattern in skip_patterns):
+            if _SKIP_RE.search(line_stripped):
                 continue
 
+            # Cheap prescreen before running the title patterns: both need a capital
+            # letter followed by another capital, whitespace, a hyphen or a comma
+            c1 = line_stripped[1:2]
+            might_be_title = ('A' <= line_stripped[0] <= 'Z'
+                              and (c1 in _TITLE_SECOND_CHARS or c1.isspace()))
+
             # Check for single-line entries (title and text on same line)
             # Pattern: "TITLE, text here." or "TITLE. Text here."
-            single_line_match = re.match(r'^([A-Z][A-Z\s\-]+?)([\.,])\s+(.+)$', line_stripped)
+            single_line_match = _SINGLE_LINE_RE.match(line_stripped) if might_be_title else None
 
             if single_line_match:
                 title = single_line_match.group(1).strip()
                 text = single_line_match.group(3).strip()
 
-                # Validate the title
-                words = re.findall(r'\b[A-Z]{3,}\b', title)
-
-                # Skip single-letter prefixes
-                if re.match(r'^[A-Z]\s', title) or re.match(r'^[A-Z]$', title):
+                # Skip single-letter prefixes (titles always start with a capital,
+                # so only the second character needs checking)
+                if len(title) == 1 or title[1].isspace():
                     # Not a valid title, treat as continuation
                     if in_content and current_entry:
-                        if current_entry['text']:
-                            current_entry['text'] += ' ' + line_stripped
-                        else:
-                            current_entry['text'] = line_stripped
+                        current_entry['chunks'].append(line_stripped)
                     continue
 
                 # Skip titles with excessive spacing
                 if title.count(' ') > 10:
                     if in_content and current_entry:
-                        if current_entry['text']:
-                            current_entry['text'] += ' ' + line_stripped
-                        else:
-                            current_entry['text'] = line_stripped
+                        current_entry['chunks'].append(line_stripped)
                     continue
 
-                # Must have enough content and valid title
-                if len(title) >= 5 and len(words) >= 1 and len(text) > 10:
+                # Must have enough content and valid title (cheap length checks first)
+                if len(title) >= 5 and len(text) > 10 and _HAS_CAPS_WORD(title):
                     # Mark that we're in content now
                     in_content = True
 
                     # Save the previous entry if it's valid
-                    if current_entry and current_entry['text']:
-                        if self.is_valid_entry(current_entry['text']):
-                            entries.append(current_entry)
-
-                    # Create new complete entry
-                    current_entry = {
-                        'title': title,
-                        'text': text
-                    }
+                    self._close_entry(current_entry, merged)
 
-                    # This is a complete entry, save it
-                    if self.is_valid_entry(current_entry['text']):
-                        entries.append(current_entry)
+                    # This is a complete entry, save it (the title is already normalized)
+                    if self.is_valid_entry(text):
+                        merged[title].append(text)
                         current_entry = None
+                    else:
+                        # Otherwise following lines may still complete it
+                        current_entry = {
+                            'title': title,
+                            'chunks': [text]
+                        }
                     continue
 
             # Check for multi-line entries (title on its own line)
             # Pattern: line with mostly uppercase letters, may have comma or period at the end
-            match = re.match(r'^([A-Z][A-Z\s\-,]+?)[\.,]\s*$', line_stripped)
+            match = _TITLE_RE.match(line_stripped) if might_be_title else None
 
             if match:
                 title = match.group(1).strip().rstrip(',.')
@@ -166,29 +223,27 @@ class BritannicaTextParser:
                 # 3. Should contain at least one complete word of 3+ letters
                 # 4. Should not have excessive spacing (OCR artifact like "M A G N E T I S M")
 
-                # Skip single-letter prefixes
-                if re.match(r'^[A-Z]\s', title) or re.match(r'^[A-Z],', title):
+                # Skip single-letter prefixes (only the second character needs checking)
+                second = title[1:2]
+                if second == ',' or second.isspace():
                     continue
 
                 # Skip titles with excessive spacing (more than 3 spaces suggests OCR issues)
                 if title.count(' ') > 10:
                     continue
 
-                words = re.findall(r'\b[A-Z]{3,}\b', title)
-
-                if len(title) >= 5 and len(words) >= 1:
+                if len(title) >= 5 and _HAS_CAPS_WORD(title):
                     # Mark that we're in content now
                     in_content = True
 
                     # Save the previous entry if it's valid
-                    if current_entry and current_entry['text']:
-                        if self.is_valid_entry(current_entry['text']):
-                            entries.append(current_entry)
+                    self._close_entry(current_entry, merged)
 
-                    # Start a new entry
+                    # Start a new entry; its lines are collected in a list
+                    # and joined once the entry is complete
                     current_entry = {
                         'title': title,
-                        'text': ''
+                        'chunks': []
                     }
                     continue
 
@@ -197,30 +252,20 @@ class BritannicaTextParser:
                 # Continue the current entry
                 # Skip very short lines that might be artifacts
                 if len(line_stripped) > 2:
-                    if current_entry['text']:
-                        current_entry['text'] += ' ' + line_stripped
-                    else:
-                        current_entry['text'] = line_stripped
+                    current_entry['chunks'].append(line_stripped)
 
         # Add the last entry if it's valid
-        if current_entry and current_entry['text']:
-            if self.is_valid_entry(current_entry['text']):
-                entries.append(current_entry)
-
-        # Merge duplicate entries
-        entries = self.merge_duplicate_entries(entries)
+        self._close_entry(current_entry, merged)
 
-        return entries
+        entries = [{'title': title, 'text': ' '.join(texts)} for title, texts in merged.items()]
+        return entries, content_lines or []
 
     def parse(self):
         """Parse the text file and return structured data."""
-        entries = self.extract_entries()
+        entries, content_lines = self._extract_entries()
 
         # If no entries were found, treat all text as a single entry
         if not entries:
-            lines = self.get_text_lines()
-            # Skip header lines and get actual content
-            content_lines = [line for line in lines if line.strip() and len(line.strip()) > 2]
             if content_lines:
                 entries = [{
                     'title': 'Unknown',
@@ -247,35 +292,162 @@ def parse_britannica_text_file(text_path):
     return parser.parse()
 
 
-def parse_britannica_text_directory(directory_path, recursive=True):
+def _parse_one(text_path):
+    """
+    Parse a single file in a worker process.
+
+    Returns:
+        Tuple of (result, error message); exactly one of them is None
+    """
+    try:
+        return parse_britannica_text_file(text_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _walk_text_files(directory, recursive):
+    """
+    Yield the paths of the .txt files in a directory using os.scandir, whose
+    entries carry their file type and so need no extra stat calls.
+    Symlinked directories are not followed.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if recursive:
+                yield from _walk_text_files(entry.path, recursive)
+        elif entry.name.endswith('.txt') and entry.is_file():
+            yield os.path.normpath(entry.path)
+
+
+def parse_britannica_text_directory(directory_path, recursive=True, workers=None, sort=True):
     """
     Parse all text files in a directory.
 
     Args:
         directory_path: Path to directory containing text files
         recursive: If True, recursively search all subdirectories (default: True)
+        workers: Number of worker processes to parse files with (default: None, parse serially)
+        sort: If True, parse files in sorted order. If False, parse them in directory
+              order as they are found, without listing every file first (default: True)
 
     Yields:
         Dictionary with parsed data for each file
     """
-    directory = Path(directory_path)
+    directory = str(Path(directory_path))
 
     # Recursively find all text files in subdirectories
-    pattern = '**/*.txt' if recursive else '*.txt'
-    text_files = sorted(directory.glob(pattern))  # Sort files for consistent ordering
+    text_files = _walk_text_files(directory, recursive)
+    if sort:
+        # Sort files component-wise for consistent ordering
+        text_files = sorted(text_files, key=lambda text_file: text_file.split(os.sep))
+
+    if workers and workers > 1:
+        # Files are independent, so parse them in parallel while keeping the order
+        text_files = list(text_files)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for text_file, (result, error) in zip(text_files, executor.map(_parse_one, text_files)):
+                if error is None:
+                    yield result
+                else:
+                    print(f"Error parsing {text_file}: {error}")
+        return
 
     for text_file in text_files:
         try:
-            yield parse_britannica_text_file(str(text_file))
+            yield parse_britannica_text_file(text_file)
         except Exception as e:
             print(f"Error parsing {text_file}: {e}")
 
 
+def _text_only(result):
+    """Reduce a parse result to entry titles and text."""
+    return {
+        'entries': [{'title': entry['title'], 'text': entry['text']}
+                   for entry in result['entries']]
+    }
+
+
+def _print_result(result):
+    """Print a parse result and a preview of its entries."""
+    print(f"\n{'='*80}")
+    print(f"Text File: {result['text_file']}")
+    print(f"Number of entries: {len(result['entries'])}")
+    print(f"{'='*80}\n")
+
+    for entry in result['entries']:
+        print(f"Title: {entry['title']}")
+        print(f"Text: {entry['text'][:200]}..." if len(entry['text']) > 200 else f"Text: {entry['text']}")
+        print(f"{'-'*80}\n")
+
+
+def _dumps_indented(obj):
+    """Serialize an object to UTF-8 encoded JSON indented by 2, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _write_json_array(items, json_path):
+    """
+    Write items to a JSON file as an indented array, one item at a time,
+    so the items never need to be held in memory together.
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    with open(json_path, 'wb', buffering=_BUFFER_SIZE) as f:
+        for item in items:
+            # Same layout as json.dump(list, indent=2): each item is indented one level
+            f.write(b'[\n  ' if count == 0 else b',\n  ')
+            f.write(_dumps_indented(item).replace(b'\n', b'\n  '))
+            count += 1
+        f.write(b'\n]' if count else b'[]')
+    return count
+
+
+def _write_split(results, json_path, size):
+    """
+    Write the entries of all results to numbered JSON files of size entries each.
+    A file is written as soon as enough entries have been collected for it.
+    """
+    # Get base filename without extension
+    base_name = os.path.splitext(json_path)[0]
+    ext = os.path.splitext(json_path)[1] or '.json'
+
+    def write_chunk(chunk, file_num):
+        output_file = f"{base_name}_{file_num}{ext}"
+        _write_json_array([{'entries': chunk}], output_file)
+        print(f"Wrote {len(chunk)} entries to {output_file}")
+
+    pending = []
+    total_files = 0
+    total_entries = 0
+    for result in results:
+        pending.extend(result['entries'])
+        total_entries += len(result['entries'])
+        while len(pending) >= size:
+            total_files += 1
+            write_chunk(pending[:size], total_files)
+            del pending[:size]
+
+    if pending:
+        total_files += 1
+        write_chunk(pending, total_files)
+
+    print(f"Total: {total_entries} entries across {total_files} file(s)")
+
+
 def main():
     """Example usage: parse and print entries from text files."""
     import sys
     import argparse
-    import json
 
     parser = argparse.ArgumentParser(description='Parse plain text Encyclopaedia Britannica files')
     parser.add_argument('path', help='Path to text file or directory')
@@ -285,91 +457,43 @@ def main():
                         help='Only include title and text in output (exclude file paths)')
     parser.add_argument('--split', type=int, metavar='N',
                         help='Split output into multiple files with N entries each (only with --json)')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='Parse files in a directory using N worker processes')
+    parser.add_argument('--unsorted', action='store_true',
+                        help='Parse files in a directory as they are found instead of in sorted order')
 
     args = parser.parse_args()
+    if args.split is not None and args.split < 1:
+        parser.error('--split must be a positive integer')
     path = args.path
 
-    results = []
-
     if os.path.isfile(path):
         # Parse single file
-        result = parse_britannica_text_file(path)
-        results.append(result)
-
-        if not args.json_output:
-            print(f"\n{'='*80}")
-            print(f"Text File: {result['text_file']}")
-            print(f"Number of entries: {len(result['entries'])}")
-            print(f"{'='*80}\n")
-
-            for entry in result['entries']:
-                print(f"Title: {entry['title']}")
-                print(f"Text: {entry['text'][:200]}..." if len(entry['text']) > 200 else f"Text: {entry['text']}")
-                print(f"{'-'*80}\n")
-
+        results = [parse_britannica_text_file(path)]
     elif os.path.isdir(path):
-        # Parse directory
-        for result in parse_britannica_text_directory(path):
-            results.append(result)
-
-            if not args.json_output:
-                print(f"\n{'='*80}")
-                print(f"Text File: {result['text_file']}")
-                print(f"Number of entries: {len(result['entries'])}")
-                print(f"{'='*80}\n")
-
-                for entry in result['entries']:
-                    print(f"Title: {entry['title']}")
-                    print(f"Text: {entry['text'][:200]}..." if len(entry['text']) > 200 else f"Text: {entry['text']}")
-                    print(f"{'-'*80}\n")
+        # Parse directory; results are produced one file at a time
+        results = parse_britannica_text_directory(path, workers=args.workers,
+                                                  sort=not args.unsorted)
     else:
         print(f"Error: {path} is not a valid file or directory")
         sys.exit(1)
 
-    # Write to JSON file if specified
-    if args.json_output:
-        # Filter results if text-only mode is enabled
-        if args.text_only:
-            filtered_results = []
-            for result in results:
-                filtered_result = {
-                    'entries': [{'title': entry['title'], 'text': entry['text']}
-                               for entry in result['entries']]
-                }
-                filtered_results.append(filtered_result)
-            output_data = filtered_results
-        else:
-            output_data = results
-
-        # Split into multiple files if requested
-        if args.split:
-            # Flatten all entries from all results
-            all_entries = []
-            for result in output_data:
-                all_entries.extend(result['entries'])
-
-            # Get base filename without extension
-            base_name = os.path.splitext(args.json_output)[0]
-            ext = os.path.splitext(args.json_output)[1] or '.json'
-
-            # Split into chunks
-            total_files = 0
-            for i in range(0, len(all_entries), args.split):
-                chunk = all_entries[i:i + args.split]
-                file_num = (i // args.split) + 1
-                output_file = f"{base_name}_{file_num}{ext}"
-
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump([{'entries': chunk}], f, indent=2, ensure_ascii=False)
-
-                total_files += 1
-                print(f"Wrote {len(chunk)} entries to {output_file}")
-
-            print(f"Total: {len(all_entries)} entries across {total_files} file(s)")
-        else:
-            with open(args.json_output, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"Wrote {len(output_data)} result(s) to {args.json_output}")
+    if not args.json_output:
+        for result in results:
+            _print_result(result)
+        return
+
+    # Write to JSON file, streaming each result out as soon as it is parsed
+    # Filter results if text-only mode is enabled
+    if args.text_only:
+        results = (_text_only(result) for result in results)
+
+    # Split into multiple files if requested
+    if args.split:
+        _write_split(results, args.json_output, args.split)
+    else:
+        count = _write_json_array(results, args.json_output)
+        print(f"Wrote {count} result(s) to {args.json_output}")
 
 
 if __name__ == '__main__':
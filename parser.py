@@ -1,10 +1,15 @@
 import xml.etree.ElementTree as et
 
-filehandler = open("encyclopaedia-britannica-sample/144133901/144133901-mets.xml","r")
-raw_data = et.parse(filehandler)
-data_root = raw_data.getroot()
-filehandler.close()
+# Stream through the METS file instead of loading the whole tree, printing the
+# children of each top-level section and freeing the section once it is done
+depth = 0
+for event, children in et.iterparse("encyclopaedia-britannica-sample/144133901/144133901-mets.xml", events=("start", "end")):
+    if event == "start":
+        depth += 1
+        continue
 
-for children in data_root:
-    for child in children:
-        print(child.tag, child.text, children.tag, children.text)
\ No newline at end of file
+    depth -= 1
+    if depth == 1:
+        for child in children:
+            print(child.tag, child.text, children.tag, children.text)
+        children.clear()